@@ -10,13 +10,32 @@ Configure the settings in the '--- USER SETTINGS ---' section below and run the
 """
 
 from PIL import Image
-from openpyxl import Workbook, load_workbook
+from openpyxl import Workbook
+from openpyxl.cell.cell import Cell
 from openpyxl.styles import PatternFill
-from openpyxl.utils import get_column_letter
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.worksheet.dimensions import ColumnDimension
+from openpyxl.utils import get_column_letter, column_index_from_string
 from pathlib import Path
+from array import array
+from functools import partial
+from lxml import etree as ET
+import numpy as np
+import zipfile
+import struct
+import zlib
+import re
 import time
+from multiprocessing import get_context
+from typing import Optional
 import sys
 
+try:
+    # Optional: compiles the pixel scatter in excel_to_image() when installed.
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # ==============================================================================
 # --- USER SETTINGS ---
 # (Configure these variables to control the script's behavior)
@@ -28,6 +47,15 @@ import sys
 # 'both':     Runs both conversions sequentially.
 OPERATION_MODE = 'both'
 
+# -- Choose the Excel writer:
+# True:  Writes the .xlsx XML directly, bypassing openpyxl (much faster for large grids).
+# False: Builds the workbook cell-by-cell with openpyxl.
+USE_FAST_EXCEL_WRITER = True
+
+# -- Number of worker processes used by the fast Excel writer.
+# None uses every CPU core; set to a small number to leave cores free.
+WORKER_PROCESSES = None
+
 # -- Define file paths:
 # The source image to convert into pixel art.
 INPUT_IMAGE_PATH = Path("image-1920x1080")
@@ -51,6 +79,37 @@ UPSCALE_FACTOR = 5
 # (The main logic for the conversions resides here)
 # ==============================================================================
 
+# Cell dimensions that make the cells roughly square, for better visual representation.
+_CELL_WIDTH = 3
+_CELL_HEIGHT = 18
+
+def _build_palette(pixel_art: Image.Image) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the unique colors of an RGB image and the palette index of every pixel.
+
+    Colors are packed into 24-bit integers, so they can be deduplicated with a
+    presence table covering every possible color. This is a single linear pass,
+    rather than the sort np.unique() would need.
+
+    Args:
+        pixel_art (Image.Image): The resized RGB image.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The sorted unique colors packed as 0xRRGGBB
+        integers, and a (height, width) array holding each pixel's index into that palette.
+    """
+    width, height = pixel_art.size
+    arr = np.frombuffer(pixel_art.tobytes(), dtype=np.uint8).reshape(height, width, 3)
+    codes = (arr[..., 0].astype(np.uint32) << 16) | (arr[..., 1].astype(np.uint32) << 8) | arr[..., 2]
+
+    present = np.zeros(1 << 24, dtype=bool)
+    present[codes] = True
+    palette = np.flatnonzero(present).astype(np.uint32)
+
+    color_to_index = np.empty(1 << 24, dtype=np.uint32)
+    color_to_index[palette] = np.arange(len(palette), dtype=np.uint32)
+    return palette, color_to_index[codes]
+
 def image_to_excel(image_path: Path, output_excel_path: Path, grid_size_x: int = 64, grid_size_y: int = 64) -> None:
     """
     Converts an image into an Excel sheet by coloring cells to represent pixels.
@@ -73,40 +132,40 @@ def image_to_excel(image_path: Path, output_excel_path: Path, grid_size_x: int =
         ws = wb.active
         ws.title = "Pixel Art"
 
-        # 3. Cache fill colors to avoid creating duplicate style objects, improving performance.
-        color_fills = {}
+        # 3. Deduplicate the colors with NumPy and register one fill per unique color
+        #    with the workbook up front. Assigning 'cell.fill' would hash and look up
+        #    the PatternFill again for every cell, so each cell gets a ready-made style
+        #    array pointing at its fill instead.
         print(f"Processing {grid_size_x}x{grid_size_y} image and writing to Excel...")
         
         # --- OPTIMIZATION START ---
-        # Get all pixel data at once using getdata(), which is much faster than calling
-        # getpixel() for each pixel individually inside a loop.
-        pixels = list(pixel_art.getdata())
-        width, _ = pixel_art.size
-
-        # Iterate over the flat list of pixels.
-        for i, (r, g, b) in enumerate(pixels):
-            hex_color = f"{r:02x}{g:02x}{b:02x}"
-
-            # Use the cached fill if available, otherwise create and cache a new one.
-            if hex_color not in color_fills:
-                color_fills[hex_color] = PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
-            
-            # Calculate the cell's row and column from the pixel's index 'i'.
-            # Adding 1 because Excel sheets are 1-indexed.
-            row = i // width + 1
-            col = i % width + 1
-            
-            ws.cell(row=row, column=col).fill = color_fills[hex_color]
+        palette, inverse = _build_palette(pixel_art)
+        del pixel_art
+        styles = []
+        for hex_color in [f"{c:06x}" for c in palette.tolist()]:
+            style = StyleArray()
+            style.fillId = wb._fills.add(PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid"))
+            styles.append(style)
+
+        # Iterate over the palette index of every pixel, row by row. A memoryview yields
+        # the indices straight from the array's buffer, instead of first materializing
+        # a Python object for every pixel the way a list would. Counting rows and columns
+        # from 1 (Excel sheets are 1-indexed) avoids deriving them from a flat index.
+        cells = ws._cells
+        for row, row_styles in enumerate(inverse, start=1):
+            for col, k in enumerate(memoryview(row_styles), start=1):
+                # Create the cell with its style directly, skipping ws.cell()'s lookup and
+                # bounds checks. Cell() copies the style array, as openpyxl mutates it in place.
+                cells[(row, col)] = Cell(ws, row=row, column=col, style_array=styles[k])
         # --- OPTIMIZATION END ---
 
         # 4. Adjust cell dimensions to be square-like for better visual representation.
+        #    One column definition spans the whole grid and the row height is set as the
+        #    sheet default, instead of sizing every column and row individually.
         print("Adjusting cell sizes...")
-        CELL_WIDTH = 3
-        CELL_HEIGHT = 18
-        for i in range(1, grid_size_x + 1):
-            ws.column_dimensions[get_column_letter(i)].width = CELL_WIDTH
-        for i in range(1, grid_size_y + 1):
-            ws.row_dimensions[i].height = CELL_HEIGHT
+        ws.column_dimensions['A'] = ColumnDimension(ws, min=1, max=grid_size_x, width=_CELL_WIDTH)
+        ws.sheet_format.defaultRowHeight = _CELL_HEIGHT
+        ws.sheet_format.customHeight = True
 
         # 5. Save the workbook.
         wb.save(output_excel_path)
@@ -119,6 +178,424 @@ def image_to_excel(image_path: Path, output_excel_path: Path, grid_size_x: int =
         print(f"An error occurred during image_to_excel: {e}")
         sys.exit(1)
 
+# --- Static parts of the .xlsx package written by image_to_excel_fast() ---
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+_CONTENT_TYPES_XML = _XML_HEADER + (
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS_XML = _XML_HEADER + (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_XML = _XML_HEADER + (
+    f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+    '<sheets><sheet name="Pixel Art" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS_XML = _XML_HEADER + (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+
+def _styles_xml(palette: np.ndarray) -> str:
+    """
+    Builds xl/styles.xml with one solid fill and one cell format per palette color.
+
+    Fills 0 and 1 are reserved by Excel ('none' and 'gray125'), and cell format 0 is
+    the default style, so palette entry k ends up as fill k + 2 and cell style k + 1.
+
+    Args:
+        palette (np.ndarray): Unique colors packed as 0xRRGGBB integers.
+    """
+    count = len(palette)
+    fills = ''.join(
+        f'<fill><patternFill patternType="solid"><fgColor rgb="FF{c:06X}"/>'
+        f'<bgColor rgb="FF{c:06X}"/></patternFill></fill>'
+        for c in palette.tolist()
+    )
+    xfs = ''.join(
+        f'<xf numFmtId="0" fontId="0" fillId="{k + 2}" borderId="0" xfId="0" applyFill="1"/>'
+        for k in range(count)
+    )
+    return _XML_HEADER + (
+        f'<styleSheet xmlns="{_MAIN_NS}">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        f'<fills count="{count + 2}">'
+        '<fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill>'
+        f'{fills}</fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        f'<cellXfs count="{count + 1}">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        f'{xfs}</cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    )
+
+
+# Target size of the band of style indices a worker formats per task. Bands are cut to
+# whole rows of about this many bytes, so a band stays in the CPU's L2 cache while it
+# is being formatted.
+_BAND_BYTES = 256 * 1024
+# zlib level for the package. The sheet XML is highly repetitive, so level 1 compresses
+# it almost as well as the default level 6 at several times the speed.
+_ZIP_COMPRESS_LEVEL = 1
+
+# Column letters for the worker processes, set once per process by the Pool initializer
+# so they are not pickled along with every task.
+_worker_col_letters: list[bytes] = []
+
+
+def _init_row_formatter(col_letters: list[bytes]) -> None:
+    """Pool initializer: stores the precomputed column letters in the worker process."""
+    global _worker_col_letters
+    _worker_col_letters = col_letters
+
+
+def _format_rows(task: tuple[int, np.ndarray]) -> bytes:
+    """
+    Formats a band of worksheet rows as '<row>' XML.
+
+    Each row is given its most common style as the row default ('customFormat'),
+    which Excel applies to every cell missing from the row. Only the cells that
+    differ from it are written, so uniform rows (sky, background) need no cells at all.
+    Tokens are formatted as bytes, so the XML never goes through a str encode pass.
+
+    Args:
+        task (tuple[int, np.ndarray]): The 1-based number of the band's first row, and
+            the (rows, columns) array of cell style indices for the band.
+
+    Returns:
+        bytes: The UTF-8 encoded XML for all rows in the band.
+    """
+    first_row, band = task
+    parts = []
+    for row, row_styles in enumerate(band, start=first_row):
+        styles, counts = np.unique(row_styles, return_counts=True)
+        default = int(styles[counts.argmax()])
+        cols = np.flatnonzero(row_styles != default)
+        row_number = b'%d' % row
+        parts.append(b'<row r="%b" s="%d" customFormat="1">' % (row_number, default))
+        parts.extend([
+            b'<c r="%b%b" s="%d"/>' % (_worker_col_letters[c], row_number, s)
+            for c, s in zip(cols.tolist(), row_styles[cols].tolist())
+        ])
+        parts.append(b'</row>')
+    return b''.join(parts)
+
+
+def image_to_excel_fast(image_path: Path, output_excel_path: Path, grid_size_x: int = 64, grid_size_y: int = 64,
+                        processes: Optional[int] = None) -> None:
+    """
+    Converts an image into an Excel sheet by writing the .xlsx XML directly.
+
+    Produces the same result as image_to_excel(), but never creates an openpyxl Cell.
+    Each row gets its most common color as the row style, and every other pixel
+    becomes a single '<c r="A1" s="K"/>' token, where K is the index of the pixel's
+    color in a deduplicated palette. The rows are formatted in parallel by a pool of
+    worker processes.
+
+    Args:
+        image_path (Path): Path to the input image.
+        output_excel_path (Path): Path to save the output Excel file.
+        grid_size_x (int): The width of the pixel grid.
+        grid_size_y (int): The height of the pixel grid.
+        processes (Optional[int]): Number of worker processes. None uses every CPU core.
+    """
+    print("--- Starting: Image to Excel Conversion (direct XML) ---")
+    try:
+        # 1. Open and resize the image using the fast NEAREST resampling method.
+        with Image.open(image_path) as img:
+            pixel_art = img.resize((grid_size_x, grid_size_y), Image.Resampling.NEAREST)
+            pixel_art = pixel_art.convert('RGB')
+
+        # 2. Deduplicate the colors, keeping the palette index of every pixel as a grid.
+        #    'inverse' maps each pixel to its palette entry; +1 skips the default style.
+        print(f"Processing {grid_size_x}x{grid_size_y} image and writing to Excel...")
+        palette, inverse = _build_palette(pixel_art)
+        del pixel_art
+        #    The indices are stored in the narrowest integer type that fits the palette,
+        #    which shrinks every band handed to the workers.
+        style_ids = (inverse + 1).astype(np.min_scalar_type(len(palette)))
+
+        # 3. Precompute the column letters once instead of converting them for every cell.
+        col_letters = [get_column_letter(i).encode('ascii') for i in range(1, grid_size_x + 1)]
+        last_cell = f"{get_column_letter(grid_size_x)}{grid_size_y}"
+
+        # 4. Write the package, streaming the worksheet so that the full sheet XML is
+        #    never held in memory. Bands of rows are formatted by the worker processes;
+        #    imap() hands the results back in order, so they can be written as they arrive.
+        #    Workers are spawned rather than forked: forking after Numba has started its
+        #    thread pool (see excel_to_image()) can deadlock the children.
+        rows_per_task = max(1, _BAND_BYTES // style_ids[0].nbytes)
+        tasks = (
+            (row + 1, style_ids[row:row + rows_per_task])
+            for row in range(0, grid_size_y, rows_per_task)
+        )
+        with zipfile.ZipFile(output_excel_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=_ZIP_COMPRESS_LEVEL) as zf:
+            zf.writestr('[Content_Types].xml', _CONTENT_TYPES_XML)
+            zf.writestr('_rels/.rels', _ROOT_RELS_XML)
+            zf.writestr('xl/workbook.xml', _WORKBOOK_XML)
+            zf.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS_XML)
+            zf.writestr('xl/styles.xml', _styles_xml(palette))
+
+            # The sheet's size is not known up front, so allow it to grow past 2 GiB.
+            with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet, \
+                    get_context('spawn').Pool(processes, initializer=_init_row_formatter, initargs=(col_letters,)) as pool:
+                sheet.write((
+                    _XML_HEADER +
+                    f'<worksheet xmlns="{_MAIN_NS}">'
+                    f'<dimension ref="A1:{last_cell}"/>'
+                    f'<sheetFormatPr defaultRowHeight="{_CELL_HEIGHT}" customHeight="1" defaultColWidth="{_CELL_WIDTH}"/>'
+                    f'<cols><col min="1" max="{grid_size_x}" width="{_CELL_WIDTH}" customWidth="1"/></cols>'
+                    '<sheetData>'
+                ).encode('utf-8'))
+                for blob in pool.imap(_format_rows, tasks, chunksize=1):
+                    sheet.write(blob)
+                sheet.write(b'</sheetData></worksheet>')
+
+        print(f"\nSuccessfully created pixel art in '{output_excel_path}'")
+
+    except FileNotFoundError:
+        print(f"Error: The input image file '{image_path}' was not found.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"An error occurred during image_to_excel_fast: {e}")
+        sys.exit(1)
+
+# --- Helpers for reading the .xlsx XML directly in excel_to_image() ---
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CELL_REF = re.compile(r'([A-Z]+)(\d+)')
+_MAX_COLUMNS = 16384  # Excel's column limit, 'XFD'.
+# Number of source rows widened at a time when upscaling the rebuilt image.
+_UPSCALE_BAND_ROWS = 16
+# zlib level for PNG output, matching PIL's default.
+_PNG_COMPRESS_LEVEL = 6
+_WHITE = (255, 255, 255)
+_BLACK = (0, 0, 0)
+
+
+def _first_sheet_path(zf: zipfile.ZipFile) -> str:
+    """
+    Resolves the zip member holding the workbook's first worksheet.
+
+    Args:
+        zf (zipfile.ZipFile): The opened .xlsx package.
+    """
+    workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+    sheet = workbook.find(f'{{{_MAIN_NS}}}sheets/{{{_MAIN_NS}}}sheet')
+    rel_id = sheet.get(f'{{{_REL_NS}}}id')
+    rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    for rel in rels.iter(f'{{{_PKG_REL_NS}}}Relationship'):
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target')
+            # Targets are usually relative to 'xl/', but may also be absolute.
+            return target.lstrip('/') if target.startswith('/') else f'xl/{target}'
+    raise ValueError(f"Worksheet relationship '{rel_id}' not found.")
+
+
+def _read_sheet_dimensions(zf: zipfile.ZipFile, sheet_path: str) -> tuple[int, int]:
+    """
+    Reads the size of a worksheet from its '<dimension ref="A1:HZ120"/>' element.
+
+    The element sits at the top of the sheet XML, so parsing stops as soon as it (or
+    the cell data) is reached, instead of scanning the whole sheet for its extent.
+
+    Args:
+        zf (zipfile.ZipFile): The opened .xlsx package.
+        sheet_path (str): The zip member holding the worksheet.
+
+    Returns:
+        tuple[int, int]: The width and height of the used range, or (0, 0) if the
+        sheet does not declare one.
+    """
+    dimension_tag = f'{{{_MAIN_NS}}}dimension'
+    with zf.open(sheet_path) as sheet:
+        for _, elem in ET.iterparse(sheet, events=('start',), tag=(dimension_tag, f'{{{_MAIN_NS}}}sheetData')):
+            if elem.tag == dimension_tag:
+                col_letters, row_digits = _CELL_REF.match(elem.get('ref').split(':')[-1]).groups()
+                return column_index_from_string(col_letters), int(row_digits)
+            break
+    return 0, 0
+
+
+def _read_style_colors(zf: zipfile.ZipFile) -> np.ndarray:
+    """
+    Builds a lookup table from cell style index to the RGB color of its fill.
+
+    Styles without a solid fill, or whose fill uses a theme or indexed color, map to white,
+    as do all styles of a package without a styles part.
+
+    Args:
+        zf (zipfile.ZipFile): The opened .xlsx package.
+
+    Returns:
+        np.ndarray: A (num_styles, 3) uint8 array, indexed by a cell's 's' attribute.
+    """
+    fill_tag = f'{{{_MAIN_NS}}}fill'
+    pattern_tag = f'{{{_MAIN_NS}}}patternFill'
+    color_tag = f'{{{_MAIN_NS}}}fgColor'
+    cell_xfs_tag = f'{{{_MAIN_NS}}}cellXfs'
+    fill_colors = []
+    style_colors = []
+    # Workbooks written by other tools may repeat the same color across many fills,
+    # so each distinct hex string is only decoded once.
+    hex_to_rgb_cache: dict[str, tuple[int, int, int]] = {}
+    try:
+        zf.getinfo('xl/styles.xml')
+    except KeyError:
+        return np.array([_WHITE], dtype=np.uint8)
+    with zf.open('xl/styles.xml') as fh:
+        # The fills are listed before the cell formats, so stop once <cellXfs> is done;
+        # the differential formats after it contain <fill> elements of their own.
+        for _, elem in ET.iterparse(fh, events=('end',), tag=(fill_tag, cell_xfs_tag)):
+            if elem.tag == cell_xfs_tag:
+                style_colors = [fill_colors[int(xf.get('fillId', 0))] for xf in elem.iterchildren(f'{{{_MAIN_NS}}}xf')]
+                break
+
+            rgb = _WHITE
+            pattern = next(elem.iterchildren(pattern_tag), None)
+            if pattern is not None and pattern.get('patternType') == 'solid':
+                color = next(pattern.iterchildren(color_tag), None)
+                if color is None:
+                    # openpyxl omits the foreground color when it is the default, black.
+                    rgb = _BLACK
+                elif color.get('rgb'):
+                    # Colors are stored as AARRGGBB, so we slice off the alpha part.
+                    hex_color = color.get('rgb')[-6:]
+                    rgb = hex_to_rgb_cache.get(hex_color)
+                    if rgb is None:
+                        # One int() parse and three shifts, instead of slicing out each channel.
+                        v = int(hex_color, 16)
+                        rgb = hex_to_rgb_cache[hex_color] = (v >> 16 & 0xff, v >> 8 & 0xff, v & 0xff)
+            fill_colors.append(rgb)
+            elem.clear()
+
+    return np.array(style_colors or [_WHITE], dtype=np.uint8)
+
+
+def _scatter_cells(canvas: np.ndarray, rows: np.ndarray, cols: np.ndarray, sids: np.ndarray,
+                   style_colors: np.ndarray) -> None:
+    """
+    Paints the fill color of every parsed cell onto the canvas.
+
+    Args:
+        canvas (np.ndarray): The (height, width, 3) uint8 image buffer to paint on.
+        rows (np.ndarray): 0-based row index of each cell.
+        cols (np.ndarray): 0-based column index of each cell.
+        sids (np.ndarray): Style index of each cell.
+        style_colors (np.ndarray): The (num_styles, 3) style-to-RGB lookup table.
+    """
+    # Viewing each RGB triple as a single 3-byte item turns this into one flat gather
+    # from the lookup table and one flat scatter into the canvas, instead of 2-D fancy
+    # indexing over three separate channel values.
+    pixels = canvas.reshape(-1).view('V3')
+    colors = np.ascontiguousarray(style_colors).reshape(-1).view('V3')
+    np.put(pixels, rows.astype(np.intp) * canvas.shape[1] + cols, np.take(colors, sids))
+
+
+if njit is not None:
+    # With Numba available, the scatter runs as a compiled loop spread over all
+    # cores, without materializing the (num_cells, 3) color array first.
+    @njit(parallel=True, cache=True)
+    def _scatter_cells(canvas, rows, cols, sids, style_colors):
+        for i in prange(rows.shape[0]):
+            r = rows[i]
+            c = cols[i]
+            k = sids[i]
+            canvas[r, c, 0] = style_colors[k, 0]
+            canvas[r, c, 1] = style_colors[k, 1]
+            canvas[r, c, 2] = style_colors[k, 2]
+
+def _widened_bands(canvas: np.ndarray, scale: int):
+    """
+    Yields the canvas in bands of rows, with every pixel repeated 'scale' times along
+    its row. Each band is small enough to stay in cache while its rows are replicated.
+
+    Args:
+        canvas (np.ndarray): The (height, width, 3) uint8 image.
+        scale (int): The upscaling factor.
+    """
+    for row in range(0, canvas.shape[0], _UPSCALE_BAND_ROWS):
+        yield row, np.repeat(canvas[row:row + _UPSCALE_BAND_ROWS], scale, axis=1)
+
+
+def _upscale(canvas: np.ndarray, scale: int) -> np.ndarray:
+    """
+    Scales an image up by an integer factor without blurring.
+
+    Every output row is a broadcast copy of a whole widened row, i.e. one contiguous
+    memcpy, rather than a per-pixel lookup like PIL's NEAREST resize.
+
+    Args:
+        canvas (np.ndarray): The (height, width, 3) uint8 image.
+        scale (int): The upscaling factor.
+    """
+    height, width, _ = canvas.shape
+    upscaled = np.empty((height * scale, width * scale, 3), dtype=np.uint8)
+    blocks = upscaled.reshape(height, scale, width * scale, 3)
+    for row, band in _widened_bands(canvas, scale):
+        blocks[row:row + len(band)] = band[:, np.newaxis]
+    return upscaled
+
+
+def _write_upscaled_png(path: Path, canvas: np.ndarray, scale: int) -> None:
+    """
+    Writes an upscaled copy of the image as an RGB PNG, encoding it band by band
+    instead of building the full-size image in memory first.
+
+    The first copy of each widened row is stored unfiltered. Its 'scale - 1' repeats use
+    PNG's 'Up' filter, which turns them into all-zero scanlines that deflate almost for free.
+
+    Args:
+        path (Path): Path to save the PNG file.
+        canvas (np.ndarray): The (height, width, 3) uint8 image.
+        scale (int): The upscaling factor.
+    """
+    height, width, _ = canvas.shape
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+    repeated_row = b'\x02' + bytes(width * scale * 3)
+    compressor = zlib.compressobj(_PNG_COMPRESS_LEVEL)
+    with open(path, 'wb') as fh:
+        def write_idat(data: bytes) -> None:
+            # The compressor only returns output once its internal buffer fills up.
+            if data:
+                fh.write(chunk(b'IDAT', data))
+
+        fh.write(b'\x89PNG\r\n\x1a\n')
+        # 8-bit depth, color type 2 (RGB), default compression/filter, no interlacing.
+        fh.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width * scale, height * scale, 8, 2, 0, 0, 0)))
+        for _, band in _widened_bands(canvas, scale):
+            # Scanlines are fed to the compressor one at a time, reusing the same all-zero
+            # repeat, so only the widened band and one output scanline are held at once.
+            for wide_row in band:
+                write_idat(compressor.compress(b'\x00'))
+                write_idat(compressor.compress(wide_row))
+                for _ in range(scale - 1):
+                    write_idat(compressor.compress(repeated_row))
+        fh.write(chunk(b'IDAT', compressor.flush()))
+        fh.write(chunk(b'IEND', b''))
+
 def excel_to_image(excel_path: Path, output_image_path: Path, scale: int = 8) -> None:
     """
     Converts an Excel sheet with colored cells back into an image file.
@@ -130,45 +607,86 @@ def excel_to_image(excel_path: Path, output_image_path: Path, scale: int = 8) ->
     """
     print("--- Starting: Excel to Image Conversion ---")
     try:
-        # 1. Load the workbook in read-only mode for better performance. This is a key
-        #    optimization when you only need to read data and styles.
-        wb = load_workbook(filename=excel_path, read_only=True, data_only=True)
-        ws = wb.active
+        # 1. Open the .xlsx package directly. Going through openpyxl would build a cell
+        #    object and re-read its style information for every single pixel.
+        with zipfile.ZipFile(excel_path) as zf:
+            # 2. Map every cell style to its fill color once, up front.
+            style_colors = _read_style_colors(zf)
 
-        # 2. Get the dimensions of the pixel art from the sheet.
-        width = ws.max_column
-        height = ws.max_row
-        
-        # 3. Create a new blank image and get direct access to its pixel data.
-        #    Using .load() is significantly faster than calling .putpixel() repeatedly.
-        img = Image.new('RGB', (width, height), color='white')
-        pixels = img.load()
-
-        print(f"Reading Excel file with dimensions {width}x{height}...")
-        # 4. Iterate through cells and set pixel data.
-        #    NOTE: Accessing cell.fill is the main performance bottleneck here, as
-        #    openpyxl has to parse the underlying XML style information for each cell.
-        #    ws.iter_rows() is the most efficient way to do this with this library.
-        for row_index, row in enumerate(ws.iter_rows()):
-            for col_index, cell in enumerate(row):
-                fill = cell.fill
-                # Ensure the cell has a fill with a color defined.
-                if fill and fill.start_color and fill.start_color.rgb:
-                    # openpyxl color format is AARRGGBB, so we slice off the 'FF' alpha part.
-                    hex_color = fill.start_color.rgb[2:]
-                    # Convert hex string to an RGB tuple.
-                    rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-                    pixels[col_index, row_index] = rgb
-                else:
-                    # Default to white if no fill is found.
-                    pixels[col_index, row_index] = (255, 255, 255)
-
-        # 5. Scale up the final image for better visibility without blurring (NEAREST resampling).
-        final_size = (width * scale, height * scale)
-        final_image = img.resize(final_size, Image.Resampling.NEAREST)
-        
-        # 6. Save the final image.
-        final_image.save(output_image_path)
+            # 3. Get the dimensions of the pixel art from the sheet's used range. Cells
+            #    styled only through their row default are not written, so the cells
+            #    alone may not reach the right and bottom edges.
+            sheet_path = _first_sheet_path(zf)
+            width, height = _read_sheet_dimensions(zf, sheet_path)
+
+            # 4. Stream the worksheet XML and record the position and style of each
+            #    cell, plus the default style of rows that set one. lxml only reports
+            #    finished '<row>' elements, and each one is cleared and detached from the
+            #    tree along with its cells once read, keeping memory flat.
+            print(f"Reading Excel file with dimensions {width}x{height}...")
+            cell_tag = f'{{{_MAIN_NS}}}c'
+            row_tag = f'{{{_MAIN_NS}}}row'
+            # Map column letters to 0-based indices with a single dict lookup per cell,
+            # built once for every column Excel supports.
+            letter_to_col = {get_column_letter(i): i - 1 for i in range(1, _MAX_COLUMNS + 1)}
+            rows, cols, sids = array('I'), array('I'), array('I')
+            styled_rows, row_sids = array('I'), array('I')
+            row_index = -1
+            with zf.open(sheet_path) as sheet:
+                for _, row in ET.iterparse(sheet, events=('end',), tag=row_tag):
+                    # The 'r' references are optional; without one, a row follows the
+                    # previous row and a cell follows the previous cell in its row.
+                    row_ref = row.get('r')
+                    row_index = int(row_ref) - 1 if row_ref else row_index + 1
+                    if row.get('customFormat') in ('1', 'true'):
+                        styled_rows.append(row_index)
+                        row_sids.append(int(row.get('s', 0)))
+                    col_index = -1
+                    for cell in row.iterchildren(cell_tag):
+                        cell_ref = cell.get('r')
+                        col_index = letter_to_col[_CELL_REF.match(cell_ref).group(1)] if cell_ref else col_index + 1
+                        rows.append(row_index)
+                        cols.append(col_index)
+                        sids.append(int(cell.get('s', 0)))
+                    row.clear()
+                    while row.getprevious() is not None:
+                        del row.getparent()[0]
+
+        rows = np.frombuffer(rows, dtype=np.uint32)
+        cols = np.frombuffer(cols, dtype=np.uint32)
+        sids = np.frombuffer(sids, dtype=np.uint32)
+        styled_rows = np.frombuffer(styled_rows, dtype=np.uint32)
+        row_sids = np.frombuffer(row_sids, dtype=np.uint32)
+
+        # 5. Fall back to the cells themselves if the sheet has no (or an outdated)
+        #    used range.
+        if len(cols):
+            width = max(width, int(cols.max()) + 1)
+            height = max(height, int(rows.max()) + 1)
+        if len(styled_rows):
+            height = max(height, int(styled_rows.max()) + 1)
+        if not width or not height:
+            raise ValueError("The worksheet contains no cells.")
+        # Style indices past the end of the table (e.g. with no styles part at all)
+        # are treated as unstyled, i.e. white.
+        num_styles = max(int(sids.max()) if len(sids) else 0, int(row_sids.max()) if len(row_sids) else 0) + 1
+        if num_styles > len(style_colors):
+            style_colors = np.concatenate([style_colors, np.full((num_styles - len(style_colors), 3), 255, dtype=np.uint8)])
+
+        # 6. Paint the row defaults and then the individual cells onto a white canvas,
+        #    each in one vectorized step.
+        print(f"Rebuilding image with dimensions {width}x{height}...")
+        canvas = np.full((height, width, 3), 255, dtype=np.uint8)
+        canvas[styled_rows] = style_colors[row_sids][:, np.newaxis, :]
+        _scatter_cells(canvas, rows, cols, sids, style_colors)
+
+        # 7. Scale up the final image for better visibility without blurring, and save it.
+        #    PNG is written one band of rows at a time, so the full-size image is never
+        #    held in memory; other formats are upscaled in memory and saved with PIL.
+        if Path(output_image_path).suffix.lower() == '.png':
+            _write_upscaled_png(output_image_path, canvas, scale)
+        else:
+            Image.fromarray(_upscale(canvas, scale), 'RGB').save(output_image_path)
         print(f"\nSuccessfully converted Excel sheet to '{output_image_path}'")
 
     except FileNotFoundError:
@@ -186,9 +704,13 @@ def main():
     Main function to run the selected operations.
     """
     start_time = time.time()
+    if USE_FAST_EXCEL_WRITER:
+        to_excel = partial(image_to_excel_fast, processes=WORKER_PROCESSES)
+    else:
+        to_excel = image_to_excel
     
     if OPERATION_MODE == 'to_excel':
-        image_to_excel(
+        to_excel(
             image_path=INPUT_IMAGE_PATH,
             output_excel_path=EXCEL_PATH,
             grid_size_x=GRID_SIZE_X,
@@ -204,7 +726,7 @@ def main():
 
     elif OPERATION_MODE == 'both':
         # Run both operations sequentially.
-        image_to_excel(
+        to_excel(
             image_path=INPUT_IMAGE_PATH,
             output_excel_path=EXCEL_PATH,
             grid_size_x=GRID_SIZE_X,